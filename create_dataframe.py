@@ -0,0 +1,68 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+logger = logging.getLogger(__name__)
+
+GTFS_DIR = 'data'
+METRO_CSV_PATH = os.path.join('data', 'metro.csv')
+
+# GTFS allows hours >= 24 for trips running past midnight, which is why the
+# times are parsed with plain integer arithmetic instead of pd.to_datetime.
+TIME_PATTERN = r'^\d+:\d\d:\d\d$'
+
+
+def load_data(file_name, gtfs_dir=GTFS_DIR, **read_kwargs):
+    file_path = os.path.join(gtfs_dir, file_name)
+    logger.info("Loading %s", file_path)
+    return pd.read_csv(file_path, **read_kwargs)
+
+
+def process_stop_times(df):
+    mask = (df['arrival_time'].str.match(TIME_PATTERN, na=False)
+            & df['departure_time'].str.match(TIME_PATTERN, na=False))
+    df = df[mask]
+    parts = df['arrival_time'].str.split(':', expand=True).astype('int32')
+    df['arrival_time_int'] = parts[0] * 3600 + parts[1] * 60 + parts[2]
+    return df
+
+
+def save_to_csv(df, output_path=METRO_CSV_PATH):
+    df.to_csv(output_path, index=False)
+    logger.info("Saved %s", output_path)
+
+
+def main(save=False):
+    trips = load_data('trips.txt')
+    routes = load_data('routes.txt')
+    stops = load_data('stops.txt')
+    stop_times = process_stop_times(load_data('stop_times.txt', engine='pyarrow',
+                                              dtype={'trip_id': 'string',
+                                                     'stop_id': 'string',
+                                                     'arrival_time': 'string',
+                                                     'departure_time': 'string'}))
+
+    tripsandroutes = trips.join(routes.set_index('route_id'), on='route_id', how='inner')
+    final_stops = stop_times.join(stops.set_index('stop_id'), on='stop_id', how='inner')
+    final = final_stops.join(tripsandroutes.set_index('trip_id'), on='trip_id', how='inner')
+    for column in ('route_short_name', 'trip_id', 'stop_id'):
+        final[column] = final[column].astype('category')
+
+    metro = final[final['route_type'] == 1].copy()
+    metro['elevation'] = np.zeros(len(metro), dtype=np.int8)
+
+    # One global sort so every line and trip downstream is a contiguous
+    # block of rows; the geojson step slices positionally instead of hashing.
+    metro = metro.sort_values(['route_short_name', 'trip_id', 'arrival_time_int'],
+                              kind='mergesort').reset_index(drop=True)
+
+    if save:
+        save_to_csv(metro)
+    return metro
+
+
+if __name__ == '__main__':
+    main(save=True)
@@ -1,19 +1,100 @@
-
-lines = metro["route_short_name"].unique()
-for line in lines:
-    df = metro.loc[metro['route_short_name'] == line]
-    dfs = dict(tuple(df.groupby('trip_id')))
-    features = []
-    for key in dfs.keys():
-        geometry = [xy for xy in zip(dfs[key].stop_lon, dfs[key].stop_lat,dfs[key].elevation, dfs[key].arrival_time_int)]
-        trip = dfs[key].trip_id.unique().tolist()
-        insert_features = geojson.Feature(geometry=geojson.LineString(geometry),
-                                          properties=dict(trip=dfs[key].trip_id.unique().tolist(),
-                                                    stop=dfs[key].stop_id.unique().tolist(),
-                                                    route=dfs[key].route_short_name.unique().tolist()
-                                                    ))
-        features.append(insert_features)
-
-        output_filename = r'<Your Directory>L\{}_new.geojson'.format(line)
-        with open(output_filename, 'w', encoding='utf8') as fp:
-                geojson.dump(geojson.FeatureCollection(features), fp, sort_keys=True, ensure_ascii=False)
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import orjson
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+logger = logging.getLogger(__name__)
+
+METRO_CSV_PATH = os.path.join('data', 'metro.csv')
+OUTPUT_DIR = 'output'
+
+NEEDED_COLUMNS = ['trip_id', 'stop_id', 'route_short_name',
+                  'stop_lon', 'stop_lat', 'elevation', 'arrival_time_int']
+
+METRO_DTYPES = {'stop_lon': 'float32',
+                'stop_lat': 'float32',
+                'elevation': 'int8',
+                'arrival_time_int': 'int32',
+                'trip_id': 'category',
+                'route_short_name': 'category',
+                'stop_id': 'category'}
+
+
+def load_metro_data(file_path=METRO_CSV_PATH):
+    logger.info("Loading metro data from %s", file_path)
+    return pd.read_csv(file_path, dtype=METRO_DTYPES)
+
+
+def ensure_directory_exists(directory):
+    if os.path.isdir(directory):
+        logger.debug("Directory %s exists", directory)
+    else:
+        os.makedirs(directory)
+        logger.info("Created directory %s", directory)
+
+
+def build_feature(trip_id, coordinates, stops, route):
+    # Keys are emitted in sorted order so the serialized output matches the
+    # old sort_keys=True dumps without a per-feature key sort.
+    return {'geometry': {'coordinates': coordinates, 'type': 'LineString'},
+            'properties': dict(route=[route],
+                               stop=pd.unique(stops).tolist(),
+                               trip=[trip_id]
+                               ),
+            'type': 'Feature'}
+
+
+def write_geojson_file(line_df, output_path):
+    coordinates = np.column_stack((line_df['stop_lon'].to_numpy(),
+                                   line_df['stop_lat'].to_numpy(),
+                                   line_df['elevation'].to_numpy(),
+                                   line_df['arrival_time_int'].to_numpy()))
+    stop_ids = line_df['stop_id'].to_numpy()
+    route = line_df['route_short_name'].iat[0]
+    # The frame is sorted by trip code, so the unique first-occurrence
+    # indices are the contiguous group boundaries.
+    trip_codes = line_df['trip_id'].cat.codes.to_numpy()
+    codes, starts = np.unique(trip_codes, return_index=True)
+    ends = np.r_[starts[1:], len(trip_codes)]
+    trip_ids = line_df['trip_id'].cat.categories
+    with open(output_path, 'wb') as fp:
+        for code, start, end in zip(codes, starts, ends):
+            fp.write(orjson.dumps(build_feature(trip_ids[code],
+                                                coordinates[start:end],
+                                                stop_ids[start:end],
+                                                route),
+                                  option=orjson.OPT_SERIALIZE_NUMPY))
+            fp.write(b'\n')
+    logger.info("Saved %s", output_path)
+
+
+def _process_line(group):
+    line, line_df = group
+    logger.info("Processing line %s", line)
+    output_path = os.path.join(OUTPUT_DIR, f'L{line}_new.geojson')
+    write_geojson_file(line_df, output_path)
+
+
+def main(df=None):
+    metro = load_metro_data() if df is None else df
+    metro = metro[NEEDED_COLUMNS]
+    ensure_directory_exists(OUTPUT_DIR)
+    # create_dataframe.main sorts metro by (route_short_name, trip_id,
+    # arrival_time_int), so each line is a contiguous block sliceable by
+    # position instead of a groupby hash pass.
+    route_codes = metro['route_short_name'].cat.codes.to_numpy()
+    codes, starts = np.unique(route_codes, return_index=True)
+    ends = np.r_[starts[1:], len(route_codes)]
+    lines = metro['route_short_name'].cat.categories
+    groups = ((lines[code], metro.iloc[start:end])
+              for code, start, end in zip(codes, starts, ends))
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(_process_line, groups))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+from create_dataframe import main as build_metro_dataframe
+from create_geojson_file import main as write_geojson_files
+
+
+def main():
+    metro = build_metro_dataframe(save=False)
+    write_geojson_files(metro)
+
+
+if __name__ == '__main__':
+    main()